@@ -1,13 +1,20 @@
 import os
 import os.path
-import pathlib
 import shutil
+import tempfile
 
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
 from typing import Dict
 from billiard.context import Process
 from billiard.exceptions import SoftTimeLimitExceeded
+from celery import uuid
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files import File
+from youtube_dl.utils import DownloadError
 
 from .celery import app
 from .models import (DynamicMix, SourceFile, StaticMix, TaskStatus,
@@ -21,6 +28,36 @@ from .youtubedl import download_audio, get_file_ext
 This module defines various Celery tasks used for Spleeter Web.
 """
 
+# Read buffer size used when copying local files to external storage. Large reads
+# reduce the number of read syscalls made while uploading large tracks.
+UPLOAD_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Individual component tracks of a dynamic mix
+PARTS = ('vocals', 'other', 'bass', 'drums')
+# File names of component tracks as written by separators
+PART_FILES = tuple(f'{part}.mp3' for part in PARTS)
+
+# Resolve path settings once instead of on every task invocation
+MEDIA_ROOT = Path(settings.MEDIA_ROOT)
+SEPARATE_DIR = settings.SEPARATE_DIR
+UPLOAD_DIR = settings.UPLOAD_DIR
+# Whether files are stored on the local filesystem, as opposed to S3/Azure Blob/etc.
+IS_LOCAL_STORAGE = settings.DEFAULT_FILE_STORAGE == 'api.storage.FileSystemStorage'
+
+LocalPaths = namedtuple('LocalPaths', ['directory', 'rel_media_dir'])
+
+def get_local_paths(base_dir: str, model_id) -> LocalPaths:
+    """
+    Get the local filesystem directory used by a task.
+
+    :param base_dir: Directory under MEDIA_ROOT (SEPARATE_DIR or UPLOAD_DIR)
+    :param model_id: Model id, used as subdirectory
+    :return: LocalPaths with the model's directory including MEDIA_ROOT, and the same
+             directory relative to MEDIA_ROOT
+    """
+    rel_media_dir = Path(base_dir, str(model_id))
+    return LocalPaths(MEDIA_ROOT / rel_media_dir, rel_media_dir)
+
 def get_separator(separator: str, separator_args: Dict, bitrate: int, cpu_separation: bool):
     """Returns separator object for corresponding source separation model."""
     if separator == 'spleeter':
@@ -34,7 +71,8 @@ def get_separator(separator: str, separator_args: Dict, bitrate: int, cpu_separa
         random_shifts = separator_args['random_shifts']
         return DemucsSeparator(separator, cpu_separation, bitrate, random_shifts)
 
-@app.task()
+# Acknowledge only after completion so that the task is requeued if the worker is killed
+@app.task(acks_late=True, reject_on_worker_lost=True)
 def create_static_mix(static_mix_id):
     """
     Task to create static mix and write to appropriate storage backend.
@@ -47,21 +85,18 @@ def create_static_mix(static_mix_id):
         # Does not exist, perhaps due to stale task
         print('StaticMix does not exist')
         return
-    static_mix.status = TaskStatus.IN_PROGRESS
-    static_mix.save()
+    StaticMix.objects.filter(id=static_mix_id).update(
+        status=TaskStatus.IN_PROGRESS)
 
     try:
         # Get paths
-        directory = os.path.join(settings.MEDIA_ROOT, settings.SEPARATE_DIR,
-                                 static_mix_id)
         filename = get_valid_filename(static_mix.formatted_name()) + '.mp3'
-        rel_media_path = os.path.join(settings.SEPARATE_DIR, static_mix_id,
-                                      filename)
-        rel_path = os.path.join(settings.MEDIA_ROOT, rel_media_path)
-        rel_path_dir = os.path.join(settings.MEDIA_ROOT, settings.SEPARATE_DIR,
-                                    static_mix_id)
+        directory, rel_media_dir = get_local_paths(SEPARATE_DIR,
+                                                   static_mix_id)
+        rel_media_path = os.fspath(rel_media_dir / filename)
+        rel_path = directory / filename
 
-        pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
+        directory.mkdir(parents=True, exist_ok=True)
         separator = get_separator(static_mix.separator,
                                   static_mix.separator_args,
                                   static_mix.bitrate, settings.CPU_SEPARATION)
@@ -74,15 +109,14 @@ def create_static_mix(static_mix_id):
         }
 
         # Non-local filesystems like S3/Azure Blob do not support source_path()
-        is_local = settings.DEFAULT_FILE_STORAGE == 'api.storage.FileSystemStorage'
-        path = static_mix.source_path() if is_local else static_mix.source_url(
-        )
+        path = static_mix.source_path(
+        ) if IS_LOCAL_STORAGE else static_mix.source_url()
 
         if not settings.CPU_SEPARATION:
             # For GPU separation, do separation in separate process.
             # Otherwise, GPU memory is not automatically freed afterwards
             process_eval = Process(target=separator.create_static_mix,
-                                   args=(parts, path, rel_path))
+                                   args=(parts, path, os.fspath(rel_path)))
             process_eval.start()
             try:
                 process_eval.join()
@@ -91,25 +125,25 @@ def create_static_mix(static_mix_id):
                 process_eval.terminate()
                 raise e
         else:
-            separator.create_static_mix(parts, path, rel_path)
+            separator.create_static_mix(parts, path, os.fspath(rel_path))
 
         # Check file exists
-        if os.path.exists(rel_path):
-            static_mix.status = TaskStatus.DONE
-            if is_local:
+        if rel_path.exists():
+            if IS_LOCAL_STORAGE:
                 # File is already on local filesystem
+                static_mix.status = TaskStatus.DONE
                 static_mix.file.name = rel_media_path
+                static_mix.save(update_fields=['status', 'file'])
             else:
-                # Need to copy local file to S3/Azure Blob/etc.
-                raw_file = open(rel_path, 'rb')
-                content_file = ContentFile(raw_file.read())
-                content_file.name = filename
-                static_mix.file = content_file
-                # Remove local file
-                os.remove(rel_path)
-                # Remove empty directory
-                os.rmdir(rel_path_dir)
-            static_mix.save()
+                # Need to copy local file to S3/Azure Blob/etc. Do this in a separate task
+                # so that this worker is freed up for the next separation.
+                upload_task_id = uuid()
+                # Point celery_id to upload task so that it can still be aborted
+                StaticMix.objects.filter(id=static_mix_id).update(
+                    celery_id=upload_task_id)
+                upload_static_mix.apply_async(
+                    (static_mix_id, os.fspath(rel_path), filename),
+                    task_id=upload_task_id)
         else:
             raise Exception('Error writing to file')
     except FileNotFoundError as error:
@@ -117,16 +151,17 @@ def create_static_mix(static_mix_id):
         print('Please make sure you have FFmpeg and FFprobe installed.')
         static_mix.status = TaskStatus.ERROR
         static_mix.error = str(error)
-        static_mix.save()
+        static_mix.save(update_fields=['status', 'error'])
     except SoftTimeLimitExceeded:
         print('Aborted!')
     except Exception as error:
         print(error)
         static_mix.status = TaskStatus.ERROR
         static_mix.error = str(error)
-        static_mix.save()
+        static_mix.save(update_fields=['status', 'error'])
 
-@app.task()
+# Acknowledge only after completion so that the task is requeued if the worker is killed
+@app.task(acks_late=True, reject_on_worker_lost=True)
 def create_dynamic_mix(dynamic_mix_id):
     """
     Task to create dynamic mix and write to appropriate storage backend.
@@ -139,35 +174,33 @@ def create_dynamic_mix(dynamic_mix_id):
         # Does not exist, perhaps due to stale task
         print('DynamicMix does not exist')
         return
-    dynamic_mix.status = TaskStatus.IN_PROGRESS
-    dynamic_mix.save()
+    DynamicMix.objects.filter(id=dynamic_mix_id).update(
+        status=TaskStatus.IN_PROGRESS)
 
     try:
         # Get paths
-        directory = os.path.join(settings.MEDIA_ROOT, settings.SEPARATE_DIR,
-                                 dynamic_mix_id)
-        rel_media_path = os.path.join(settings.SEPARATE_DIR, dynamic_mix_id)
+        rel_path, rel_media_dir = get_local_paths(SEPARATE_DIR,
+                                                  dynamic_mix_id)
+        rel_media_path = os.fspath(rel_media_dir)
         file_prefix = get_valid_filename(dynamic_mix.formatted_prefix())
         file_suffix = dynamic_mix.formatted_suffix()
-        rel_path = os.path.join(settings.MEDIA_ROOT, rel_media_path)
 
-        pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
+        rel_path.mkdir(parents=True, exist_ok=True)
         separator = get_separator(dynamic_mix.separator,
                                   dynamic_mix.separator_args,
                                   dynamic_mix.bitrate,
                                   settings.CPU_SEPARATION)
 
         # Non-local filesystems like S3/Azure Blob do not support source_path()
-        is_local = settings.DEFAULT_FILE_STORAGE == 'api.storage.FileSystemStorage'
         path = dynamic_mix.source_path(
-        ) if is_local else dynamic_mix.source_url()
+        ) if IS_LOCAL_STORAGE else dynamic_mix.source_url()
 
         # Do separation
         if not settings.CPU_SEPARATION:
             # For GPU separation, do separation in separate process.
             # Otherwise, GPU memory is not automatically freed afterwards
             process_eval = Process(target=separator.separate_into_parts,
-                                   args=(path, rel_path))
+                                   args=(path, os.fspath(rel_path)))
             process_eval.start()
             try:
                 process_eval.join()
@@ -176,18 +209,25 @@ def create_dynamic_mix(dynamic_mix_id):
                 process_eval.terminate()
                 raise e
         else:
-            separator.separate_into_parts(path, rel_path)
+            separator.separate_into_parts(path, os.fspath(rel_path))
 
-        # Check all parts exist
-        if exists_all_parts(rel_path):
-            rename_all_parts(rel_path, file_prefix, file_suffix)
-            dynamic_mix.status = TaskStatus.DONE
-            if is_local:
+        # Check all parts exist and give them their final names
+        if verify_and_rename_all_parts(rel_path, file_prefix, file_suffix):
+            if IS_LOCAL_STORAGE:
+                dynamic_mix.status = TaskStatus.DONE
                 save_to_local_storage(dynamic_mix, rel_media_path, file_prefix,
                                       file_suffix)
             else:
-                save_to_ext_storage(dynamic_mix, rel_path, file_prefix,
-                                    file_suffix)
+                # Upload parts to S3/Azure Blob/etc. in a separate task so that this
+                # worker is freed up for the next separation.
+                upload_task_id = uuid()
+                # Point celery_id to upload task so that it can still be aborted
+                DynamicMix.objects.filter(id=dynamic_mix_id).update(
+                    celery_id=upload_task_id)
+                upload_dynamic_mix.apply_async(
+                    (dynamic_mix_id, os.fspath(rel_path), file_prefix,
+                     file_suffix),
+                    task_id=upload_task_id)
         else:
             raise Exception('Error writing to file')
     except FileNotFoundError as error:
@@ -195,17 +235,92 @@ def create_dynamic_mix(dynamic_mix_id):
         print('Please make sure you have FFmpeg and FFprobe installed.')
         dynamic_mix.status = TaskStatus.ERROR
         dynamic_mix.error = str(error)
-        dynamic_mix.save()
+        dynamic_mix.save(update_fields=['status', 'error'])
     except SoftTimeLimitExceeded:
         print('Aborted!')
     except Exception as error:
         print(error)
         dynamic_mix.status = TaskStatus.ERROR
         dynamic_mix.error = str(error)
-        dynamic_mix.save()
+        dynamic_mix.save(update_fields=['status', 'error'])
+
+@app.task()
+def upload_static_mix(static_mix_id, rel_path, filename):
+    """
+    Task to copy a locally created static mix to external file storage (S3, Azure, etc.).
+
+    :param static_mix_id: The id of the StaticMix
+    :param rel_path: Relative path to local static mix file
+    :param filename: Name of static mix file
+    """
+    try:
+        static_mix = StaticMix.objects.get(id=static_mix_id)
+    except StaticMix.DoesNotExist:
+        # Does not exist, perhaps due to stale task
+        print('StaticMix does not exist')
+        shutil.rmtree(os.path.dirname(rel_path), ignore_errors=True)
+        return
 
-@app.task(autoretry_for=(Exception, ),
-          default_retry_delay=3,
+    try:
+        # Stream file to storage backend instead of reading it all into memory
+        with open(rel_path, 'rb', buffering=UPLOAD_BUFFER_SIZE) as raw_file:
+            static_mix.file.save(filename, File(raw_file), save=False)
+        # The model is saved only after the upload since the storage backend may store the
+        # file under a different name than requested (e.g. to avoid overwriting)
+        static_mix.status = TaskStatus.DONE
+        static_mix.save(update_fields=['status', 'file'])
+    except SoftTimeLimitExceeded:
+        print('Aborted!')
+    except Exception as error:
+        print(error)
+        static_mix.status = TaskStatus.ERROR
+        static_mix.error = str(error)
+        static_mix.save(update_fields=['status', 'error'])
+    finally:
+        # Remove local directory after saving (so a cleanup failure cannot lose the upload),
+        # and also on error or abort so that staged files do not pile up
+        shutil.rmtree(os.path.dirname(rel_path), ignore_errors=True)
+
+@app.task()
+def upload_dynamic_mix(dynamic_mix_id, rel_path_dir, file_prefix: str,
+                       file_suffix: str):
+    """
+    Task to copy locally created dynamic mix parts to external file storage (S3, Azure, etc.).
+
+    :param dynamic_mix_id: The id of the DynamicMix
+    :param rel_path_dir: Relative path to DynamicMix ID directory
+    :param file_prefix: Filename prefix
+    :param file_suffix: Filename suffix
+    """
+    try:
+        dynamic_mix = DynamicMix.objects.get(id=dynamic_mix_id)
+    except DynamicMix.DoesNotExist:
+        # Does not exist, perhaps due to stale task
+        print('DynamicMix does not exist')
+        shutil.rmtree(rel_path_dir, ignore_errors=True)
+        return
+
+    try:
+        dynamic_mix.status = TaskStatus.DONE
+        save_to_ext_storage(dynamic_mix, rel_path_dir, file_prefix,
+                            file_suffix)
+    except SoftTimeLimitExceeded:
+        print('Aborted!')
+    except Exception as error:
+        print(error)
+        dynamic_mix.status = TaskStatus.ERROR
+        dynamic_mix.error = str(error)
+        dynamic_mix.save(update_fields=['status', 'error'])
+    finally:
+        # Remove local directory, along with any leftover files, whether or not the
+        # upload succeeded so that staged files do not pile up
+        shutil.rmtree(rel_path_dir, ignore_errors=True)
+
+# Only retry on network errors, since other errors (e.g. video too long) would fail again
+@app.task(autoretry_for=(ConnectionError, TimeoutError, DownloadError),
+          retry_backoff=3,
+          retry_backoff_max=60,
+          retry_jitter=True,
           retry_kwargs={'max_retries': settings.YOUTUBE_MAX_RETRIES})
 def fetch_youtube_audio(source_file_id, fetch_task_id, artist, title, link):
     """
@@ -225,76 +340,96 @@ def fetch_youtube_audio(source_file_id, fetch_task_id, artist, title, link):
         return
     fetch_task = YTAudioDownloadTask.objects.get(id=fetch_task_id)
     # Mark as in progress
-    fetch_task.status = TaskStatus.IN_PROGRESS
-    fetch_task.save()
+    YTAudioDownloadTask.objects.filter(id=fetch_task_id).update(
+        status=TaskStatus.IN_PROGRESS)
 
     try:
-        # Get paths
-        directory = os.path.join(settings.MEDIA_ROOT, settings.UPLOAD_DIR,
-                                 str(source_file_id))
         filename = get_valid_filename(artist + ' - ' +
                                       title) + get_file_ext(link)
-        rel_media_path = os.path.join(settings.UPLOAD_DIR, str(source_file_id),
-                                      filename)
-        rel_path = os.path.join(settings.MEDIA_ROOT, rel_media_path)
-        pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
 
-        # Start download
-        download_audio(link, rel_path)
+        if IS_LOCAL_STORAGE:
+            # Download directly into media directory
+            directory, rel_media_dir = get_local_paths(UPLOAD_DIR,
+                                                       source_file_id)
+            rel_media_path = os.fspath(rel_media_dir / filename)
+            rel_path = directory / filename
+            directory.mkdir(parents=True, exist_ok=True)
+            download_audio(link, rel_path)
 
-        is_local = settings.DEFAULT_FILE_STORAGE == 'api.storage.FileSystemStorage'
-
-        # Check file exists
-        if os.path.exists(rel_path):
-            fetch_task.status = TaskStatus.DONE
-            if is_local:
-                # File is already on local filesystem
-                source_file.file.name = rel_media_path
-            else:
-                # Need to copy local file to S3/Azure Blob/etc.
-                raw_file = open(rel_path, 'rb')
-                content_file = ContentFile(raw_file.read())
-                content_file.name = filename
-                source_file.file = content_file
-                rel_dir_path = os.path.join(settings.MEDIA_ROOT,
-                                            settings.UPLOAD_DIR,
-                                            source_file_id)
-                # Remove local file
-                os.remove(rel_path)
-                # Remove empty directory
-                os.rmdir(rel_dir_path)
-            fetch_task.save()
-            source_file.save()
+            if not rel_path.exists():
+                raise Exception('Error writing to file')
+            source_file.file.name = rel_media_path
+            source_file.save(update_fields=['file'])
         else:
-            raise Exception('Error writing to file')
+            # File only needs to exist locally until it is copied to S3/Azure Blob/etc., so
+            # download it to a temporary directory that is removed afterwards, even if the
+            # download fails
+            with tempfile.TemporaryDirectory() as temp_dir:
+                rel_path = Path(temp_dir, filename)
+                download_audio(link, rel_path)
+
+                if not rel_path.exists():
+                    raise Exception('Error writing to file')
+                # Stream file to storage backend instead of reading it all into memory
+                with open(rel_path, 'rb',
+                          buffering=UPLOAD_BUFFER_SIZE) as raw_file:
+                    source_file.file.save(filename,
+                                          File(raw_file),
+                                          save=False)
+                source_file.save(update_fields=['file'])
+
+        fetch_task.status = TaskStatus.DONE
+        fetch_task.save(update_fields=['status'])
     except SoftTimeLimitExceeded:
         print('Aborted!')
     except Exception as error:
         print(error)
         fetch_task.status = TaskStatus.ERROR
         fetch_task.error = str(error)
-        fetch_task.save()
+        fetch_task.save(update_fields=['status', 'error'])
         raise error
 
-def exists_all_parts(rel_path):
-    """Returns whether all of the individual component tracks exist on filesystem."""
-    parts = ['vocals', 'other', 'bass', 'drums']
-    for part in parts:
-        rel_part_path = os.path.join(rel_path, f'{part}.mp3')
-        if not os.path.exists(rel_part_path):
-            print(f'{rel_part_path} does not exist')
+def verify_and_rename_all_parts(rel_path, file_prefix: str,
+                                file_suffix: str):
+    """
+    Checks that all of the individual component tracks exist on filesystem, and if so,
+    renames them to names with track artist and title.
+
+    :param rel_path: Relative path to DynamicMix ID directory
+    :param file_prefix: Filename prefix
+    :param file_suffix: Filename suffix
+    :return: Whether all component tracks exist
+    """
+    # List directory once instead of checking each part separately
+    with os.scandir(rel_path) as entries:
+        filenames = {entry.name for entry in entries}
+    for part_filename in PART_FILES:
+        if part_filename not in filenames:
+            print(f'{os.path.join(rel_path, part_filename)} does not exist')
             return False
-    return True
 
-def rename_all_parts(rel_path, file_prefix: str, file_suffix: str):
-    """Renames individual part files to names with track artist and title."""
-    parts = ['vocals', 'other', 'bass', 'drums']
-    for part in parts:
-        old_rel_path = os.path.join(rel_path, f'{part}.mp3')
-        new_rel_path = os.path.join(
-            rel_path, f'{file_prefix} ({part}) {file_suffix}.mp3')
-        print(f'Renaming {old_rel_path} to {new_rel_path}')
-        os.rename(old_rel_path, new_rel_path)
+    # Open directory once and rename relative to it, so the directory path is not
+    # resolved again for every part (not supported on Windows). os.replace accepts dir
+    # fds wherever os.rename does, but only os.rename is listed in os.supports_dir_fd.
+    dir_fd = os.open(rel_path, os.O_RDONLY | os.O_DIRECTORY
+                     ) if os.rename in os.supports_dir_fd else None
+    try:
+        for part, old_filename in zip(PARTS, PART_FILES):
+            new_filename = f'{file_prefix} ({part}) {file_suffix}.mp3'
+            old_rel_path = os.path.join(rel_path, old_filename)
+            new_rel_path = os.path.join(rel_path, new_filename)
+            print(f'Renaming {old_rel_path} to {new_rel_path}')
+            if dir_fd is None:
+                os.replace(old_rel_path, new_rel_path)
+            else:
+                os.replace(old_filename,
+                           new_filename,
+                           src_dir_fd=dir_fd,
+                           dst_dir_fd=dir_fd)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return True
 
 def save_to_local_storage(dynamic_mix, rel_media_path, file_prefix: str,
                           file_suffix: str):
@@ -304,20 +439,13 @@ def save_to_local_storage(dynamic_mix, rel_media_path, file_prefix: str,
     :param rel_media_path: Relative path from media/ to DynamicMix ID directory
     :param file_prefix: Filename prefix
     """
-    rel_media_path_vocals = os.path.join(
-        rel_media_path, f'{file_prefix} (vocals) {file_suffix}.mp3')
-    rel_media_path_other = os.path.join(
-        rel_media_path, f'{file_prefix} (other) {file_suffix}.mp3')
-    rel_media_path_bass = os.path.join(
-        rel_media_path, f'{file_prefix} (bass) {file_suffix}.mp3')
-    rel_media_path_drums = os.path.join(
-        rel_media_path, f'{file_prefix} (drums) {file_suffix}.mp3')
     # File is already on local filesystem
-    dynamic_mix.vocals_file.name = rel_media_path_vocals
-    dynamic_mix.other_file.name = rel_media_path_other
-    dynamic_mix.bass_file.name = rel_media_path_bass
-    dynamic_mix.drums_file.name = rel_media_path_drums
-    dynamic_mix.save()
+    for part in PARTS:
+        getattr(dynamic_mix, f'{part}_file').name = os.path.join(
+            rel_media_path, f'{file_prefix} ({part}) {file_suffix}.mp3')
+    dynamic_mix.save(update_fields=[
+        'status', 'vocals_file', 'other_file', 'bass_file', 'drums_file'
+    ])
 
 def save_to_ext_storage(dynamic_mix, rel_path_dir, file_prefix: str,
                         file_suffix: str):
@@ -327,26 +455,43 @@ def save_to_ext_storage(dynamic_mix, rel_path_dir, file_prefix: str,
     :param rel_path_dir: Relative path to DynamicMix ID directory
     :param file_prefix: Filename prefix
     """
-    parts = ['vocals', 'other', 'bass', 'drums']
-    filenames = {
-        'vocals': f'{file_prefix} (vocals) {file_suffix}.mp3',
-        'other': f'{file_prefix} (other) {file_suffix}.mp3',
-        'bass': f'{file_prefix} (bass) {file_suffix}.mp3',
-        'drums': f'{file_prefix} (drums) {file_suffix}.mp3'
-    }
-    content_files = {}
-
-    for part in parts:
-        filename = filenames[part]
+    def upload_part(part):
+        filename = f'{file_prefix} ({part}) {file_suffix}.mp3'
         rel_path = os.path.join(rel_path_dir, filename)
-        raw_file = open(rel_path, 'rb')
-        content_files[part] = ContentFile(raw_file.read())
-        content_files[part].name = filename
+        # Stream file to storage backend instead of reading it all into memory
+        with open(rel_path, 'rb', buffering=UPLOAD_BUFFER_SIZE) as raw_file:
+            getattr(dynamic_mix, f'{part}_file').save(filename,
+                                                       File(raw_file),
+                                                       save=False)
+        # Remove local file as soon as it is uploaded, while other parts are still uploading.
+        # This is best-effort, since the upload task removes the directory afterwards and a
+        # cleanup failure must not discard the upload.
+        with suppress(OSError):
+            os.unlink(rel_path)
 
-    dynamic_mix.vocals_file = content_files['vocals']
-    dynamic_mix.other_file = content_files['other']
-    dynamic_mix.bass_file = content_files['bass']
-    dynamic_mix.drums_file = content_files['drums']
-    dynamic_mix.save()
+    def delete_part(part, future):
+        # Remove uploaded file, since it will not be referenced by the model
+        part_file = getattr(dynamic_mix, f'{part}_file')
+        if not future.cancelled() and part_file:
+            part_file.delete(save=False)
 
-    shutil.rmtree(rel_path_dir, ignore_errors=True)
+    # Parts are independent, so upload them concurrently
+    executor = ThreadPoolExecutor(max_workers=len(PARTS))
+    futures = {part: executor.submit(upload_part, part) for part in PARTS}
+    try:
+        for future in as_completed(futures.values()):
+            # Re-raise the first upload error, if any
+            future.result()
+        dynamic_mix.save(update_fields=[
+            'status', 'vocals_file', 'other_file', 'bass_file', 'drums_file'
+        ])
+    except Exception:
+        # On error or abort (SoftTimeLimitExceeded), cancel uploads that have not started
+        # and delete uploaded parts, including in-flight ones once they finish
+        for part, future in futures.items():
+            future.cancel()
+            future.add_done_callback(partial(delete_part, part))
+        raise
+    finally:
+        # Do not wait for in-flight uploads, so that aborting takes effect immediately
+        executor.shutdown(wait=False)
@@ -1,5 +1,10 @@
 import re
 
+INVALID_FILENAME_CHARS = re.compile(r'(?u)[^-\w\s.,[\]()]')
+# ASCII characters matched by INVALID_FILENAME_CHARS, for use with bytes.translate()
+INVALID_ASCII_FILENAME_BYTES = bytes(
+    c for c in range(128) if INVALID_FILENAME_CHARS.match(chr(c)))
+
 def get_valid_filename(s):
     """
     Return the given string converted to a string that can be used for a clean
@@ -9,4 +14,10 @@ def get_valid_filename(s):
     'johns_portrait_in_2004.jpg'
     """
     s = str(s).strip()
-    return re.sub(r'(?u)[^-\w\s.,[\]()]', '', s)
+    try:
+        ascii_bytes = s.encode('ascii')
+    except UnicodeEncodeError:
+        return INVALID_FILENAME_CHARS.sub('', s)
+    # Fast path for the common all-ASCII case, which avoids a regex pass
+    return ascii_bytes.translate(None,
+                                 INVALID_ASCII_FILENAME_BYTES).decode('ascii')
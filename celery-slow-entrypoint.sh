@@ -6,6 +6,8 @@ echo "Starting Celery (slow)"
 
 mkdir -p celery
 
+# Separation tasks are long-running, so only reserve one task per process at a time
 celery -A api worker -l INFO -Q slow_queue \
     --concurrency $CELERY_SLOW_QUEUE_CONCURRENCY \
+    --prefetch-multiplier 1 \
     --statedb=./celery/celery-slow.state 
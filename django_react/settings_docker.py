@@ -26,6 +26,9 @@ AZURE_ACCOUNT_NAME = os.getenv('AZURE_ACCOUNT_NAME', '')
 AZURE_CONTAINER = os.getenv('AZURE_CONTAINER', '')
 AZURE_CUSTOM_DOMAIN = os.getenv('AZURE_CUSTOM_DOMAIN')
 AZURE_OBJECT_PARAMETERS = {'content_disposition': 'attachment'}
+# Number of parallel connections used to upload each blob (S3 uploads are already
+# multithreaded by boto3)
+AZURE_UPLOAD_MAX_CONN = 4
 
 ################################
 # AWS storage backend settings #
@@ -46,6 +49,12 @@ AWS_S3_REGION_NAME = 'us-east-1'
 
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
+# Separation tasks are acknowledged late, so Redis must not redeliver them while they are
+# still running. CPU separation of long tracks can take well over the default of 1 hour.
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 12 * 60 * 60}
+# Tasks without an explicit route go to the fast queue, since no worker consumes Celery's
+# default queue
+CELERY_TASK_DEFAULT_QUEUE = 'fast_queue'
 CELERY_TASK_ROUTES = {
     'api.tasks.create_static_mix': {
         'queue': 'slow_queue'
@@ -53,6 +62,12 @@ CELERY_TASK_ROUTES = {
     'api.tasks.create_dynamic_mix': {
         'queue': 'slow_queue'
     },
+    'api.tasks.upload_static_mix': {
+        'queue': 'fast_queue'
+    },
+    'api.tasks.upload_dynamic_mix': {
+        'queue': 'fast_queue'
+    },
     'api.tasks.fetch_youtube_audio': {
         'queue': 'fast_queue'
     },